@@ -25,6 +25,8 @@ from datetime import datetime, timedelta
 import threading
 import uuid
 
+from sortedcontainers import SortedList
+
 class VehicleType(Enum):
     """Enumeration of supported vehicle types."""
     SMALL = "Small"  # e.g., motorcycles, compact cars
@@ -159,6 +161,17 @@ class Vehicle:
     Represents a vehicle in the parking system with enhanced policy tracking.
     """
 
+    # The lot creates a Vehicle per request; __slots__ drops the per-instance
+    # __dict__ and roughly halves the memory footprint
+    __slots__ = (
+        'vehicle_type', 'customer_type', 'license_plate', 'ticket_id',
+        'allocation_time', 're_entry_count', 'last_re_entry',
+        'total_overstay_penalty', 'warnings_issued', 'is_suspended',
+        'suspension_reason', 'parking_sessions', 'total_parking_time',
+        'total_fees_paid', 'accessible_parking', 'ev_charging',
+        'reservation_id', 'vip_pass_expiry'
+    )
+
     def __init__(self, vehicle_type, customer_type, license_plate):
         """
         Initialize a new vehicle.
@@ -240,11 +253,19 @@ class Slot:
         level (int): Floor level (1 or 2)
         section (Section): Section type (Regular/VIP/EV)
         vehicle_type (VehicleType): Supported vehicle type
+        is_ev (bool): Whether this is an EV charging slot
         vehicle (Vehicle): Currently parked vehicle (None if empty)
         allocation_time (datetime): When current vehicle was allocated
         is_occupied (bool): Whether slot is currently occupied
     """
 
+    # 186 Slot instances live for the process lifetime and are scanned often;
+    # __slots__ keeps them compact and cache-friendly
+    __slots__ = (
+        'id', 'level', 'section', 'vehicle_type', 'is_ev', 'vehicle',
+        'allocation_time', 'expiry_time', 'is_occupied'
+    )
+
     def __init__(self, slot_id, level, section, vehicle_type):
         """
         Initialize a new parking slot.
@@ -259,8 +280,10 @@ class Slot:
         self.level = level
         self.section = section
         self.vehicle_type = vehicle_type
+        self.is_ev = section == Section.EV  # Fixed for the slot's lifetime
         self.vehicle = None
         self.allocation_time = None
+        self.expiry_time = None  # Maintained by ParkingLot for the expiry index
         self.is_occupied = False
 
     def allocate(self, vehicle):
@@ -427,6 +450,30 @@ class ParkingLot:
                     slot = Slot(f"E{level}{vehicle_type.value[0]}{i+1:02d}", level, Section.EV, vehicle_type)
                     self.slots[slot.id] = slot
 
+        # Slots bucketed by (level, vehicle_type, section); the layout is
+        # fixed, so both allocation search and the status builders can use
+        # direct lookups instead of filtering every slot
+        self.slot_buckets = {}
+        for slot in self.slots.values():
+            self.slot_buckets.setdefault((slot.level, slot.vehicle_type, slot.section), []).append(slot)
+
+        # Incremental occupancy bookkeeping, maintained on allocate/release so
+        # status queries are O(1) lookups instead of full slot scans
+        self._occupied = {}  # ticket_id -> occupied Slot
+        self._occupied_count = 0
+        self._available_counts = {}
+        for slot in self.slots.values():
+            key = (slot.vehicle_type, slot.section)
+            self._available_counts[key] = self._available_counts.get(key, 0) + 1
+
+        # Sorted (expiry_time, slot_id) pairs for occupied slots, so counting
+        # expired slots is a bisect rather than an is_expired() scan
+        self._expiry_index = SortedList()
+
+        # Set on every mutation; lets the service layer cache serialized
+        # status payloads and invalidate them only when the lot changes
+        self.status_dirty = True
+
     def find_slot(self, vehicle_type, customer_type, is_ev=False):
         """
         Find an available slot for the given vehicle and customer type.
@@ -491,24 +538,14 @@ class ParkingLot:
         Returns:
             Slot: Available slot or None
         """
-        # Get all slots in the section that match the vehicle type
-        section_slots = [slot for slot in self.slots.values()
-                        if slot.section == section and slot.vehicle_type == vehicle_type and not slot.is_occupied]
-
-        if not section_slots:
-            return None        # For VIP sections, prefer lower level first
-        if section == Section.VIP:
-            section_slots.sort(key=lambda s: s.level)
-
-        # For regular sections, prefer lower level first
-        elif section == Section.REGULAR:
-            section_slots.sort(key=lambda s: s.level)
-
-        # For EV sections, prefer lower level first
-        else:  # Section.EV
-            section_slots.sort(key=lambda s: s.level)
-
-        return section_slots[0] if section_slots else None
+        # All sections prefer lower levels first; the buckets are built in
+        # level order, so walking level 1 before level 2 keeps that
+        # preference without filtering and sorting every slot
+        for level in [1, 2]:
+            for slot in self.slot_buckets.get((level, vehicle_type, section), []):
+                if not slot.is_occupied:
+                    return slot
+        return None
 
     def allocate_slot(self, vehicle, is_ev=False):
         """
@@ -524,9 +561,37 @@ class ParkingLot:
         with self.lock:
             slot = self.find_slot(vehicle.vehicle_type, vehicle.customer_type, is_ev)
             if slot and slot.allocate(vehicle):
+                self._occupied[vehicle.ticket_id] = slot
+                self._occupied_count += 1
+                self._available_counts[(slot.vehicle_type, slot.section)] -= 1
+                slot.expiry_time = self._slot_expiry(slot)
+                self._expiry_index.add((slot.expiry_time, slot.id))
+                self.status_dirty = True
                 return slot
             return None
 
+    def _slot_expiry(self, slot):
+        """
+        Compute the time at which an occupied slot becomes expired.
+
+        Mirrors Slot.is_expired(): regular customers get 24 hours, VIP
+        customers get 30 days, and an active VIP pass extends the limit to
+        the pass expiry.
+
+        Args:
+            slot (Slot): An occupied slot
+
+        Returns:
+            datetime: Expiry timestamp for the current occupancy
+        """
+        if slot.vehicle.customer_type == CustomerType.REGULAR:
+            return slot.allocation_time + timedelta(hours=24)
+
+        expiry = slot.allocation_time + timedelta(days=30)
+        if slot.vehicle.vip_pass_expiry and slot.vehicle.vip_pass_expiry > expiry:
+            expiry = slot.vehicle.vip_pass_expiry
+        return expiry
+
     def release_slot(self, ticket_id):
         """
         Release a slot by ticket ID.
@@ -538,11 +603,18 @@ class ParkingLot:
             Slot: Released slot or None if ticket not found
         """
         with self.lock:
-            for slot in self.slots.values():
-                if slot.is_occupied and slot.vehicle.ticket_id == ticket_id:
-                    vehicle = slot.release()
-                    return slot
-            return None
+            slot = self._occupied.pop(ticket_id, None)
+            if slot is None:
+                return None
+
+            vehicle = slot.release()
+            self._occupied_count -= 1
+            self._available_counts[(slot.vehicle_type, slot.section)] += 1
+            if slot.expiry_time is not None:
+                self._expiry_index.discard((slot.expiry_time, slot.id))
+                slot.expiry_time = None
+            self.status_dirty = True
+            return slot
 
     def get_slot_by_ticket(self, ticket_id):
         """
@@ -555,10 +627,7 @@ class ParkingLot:
             Slot: Slot with the ticket or None
         """
         with self.lock:
-            for slot in self.slots.values():
-                if slot.is_occupied and slot.vehicle.ticket_id == ticket_id:
-                    return slot
-            return None
+            return self._occupied.get(ticket_id)
 
     def get_all_slots(self):
         """
@@ -578,7 +647,7 @@ class ParkingLot:
             list: List of occupied Slot objects
         """
         with self.lock:
-            return [slot for slot in self.slots.values() if slot.is_occupied]
+            return list(self._occupied.values())
 
     def get_available_slots_count(self):
         """
@@ -592,11 +661,43 @@ class ParkingLot:
             for vehicle_type in VehicleType:
                 counts[vehicle_type.value] = {}
                 for section in Section:
-                    count = len([slot for slot in self.slots.values()
-                               if slot.vehicle_type == vehicle_type and slot.section == section and not slot.is_occupied])
-                    counts[vehicle_type.value][section.value] = count
+                    counts[vehicle_type.value][section.value] = self._available_counts[(vehicle_type, section)]
             return counts
 
+    @property
+    def total_count(self):
+        """Total number of slots in the lot."""
+        return len(self.slots)
+
+    @property
+    def occupied_count(self):
+        """Number of currently occupied slots (maintained incrementally)."""
+        with self.lock:
+            return self._occupied_count
+
+    @property
+    def available_count(self):
+        """Number of currently available slots (maintained incrementally)."""
+        with self.lock:
+            return len(self.slots) - self._occupied_count
+
+    def expired_count(self, now=None):
+        """
+        Count occupied slots past their time limit via the expiry index.
+
+        Args:
+            now (datetime): Reference time, defaults to datetime.now()
+
+        Returns:
+            int: Number of expired slots
+        """
+        with self.lock:
+            if now is None:
+                now = datetime.now()
+            # Entries sort by (expiry_time, slot_id); '' sorts before every
+            # slot id, so this counts entries strictly older than now
+            return self._expiry_index.bisect_left((now, ''))
+
     def check_expired_slots(self):
         """
         Check for expired slots and return them.
@@ -656,9 +757,8 @@ class ParkingLot:
 
             # Check if vehicle already parked (only for regular customers - VIP allows multiple parking)
             if vehicle.customer_type == CustomerType.REGULAR:
-                for slot in self.slots.values():
-                    if (slot.is_occupied and
-                        slot.vehicle.license_plate == vehicle.license_plate):
+                for slot in self._occupied.values():
+                    if slot.vehicle.license_plate == vehicle.license_plate:
                         return False, "Vehicle already parked"
 
             return True, "Entry allowed"
@@ -4,7 +4,7 @@ Parking Management System - Web Service Module
 This module implements the Flask web application with SocketIO for real-time communication.
 It provides REST endpoints and WebSocket events for parking slot allocation and release,
 receipt generation, and status updates. The service handles concurrent requests using
-threading and provides comprehensive logging.
+gevent greenlets and provides comprehensive logging.
 
 Key Features:
 - WebSocket-based real-time updates for live UI synchronization
@@ -21,21 +21,147 @@ Endpoints:
 Dependencies:
 - Flask: Web framework
 - Flask-SocketIO: WebSocket support
+- gevent: Cooperative concurrency for the WebSocket server
 - parking_models: Core business logic
 """
 
-from flask import Flask, render_template, request, jsonify
+# Monkey-patch the stdlib before anything else imports sockets/threads so all
+# I/O is cooperatively scheduled on the gevent event loop
+from gevent import monkey
+monkey.patch_all()
+
+from flask import Flask, render_template, request
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
 import logging
-from parking_models import *
-from datetime import datetime
+import os
+import orjson
+from parking_models import (CustomerType, ParkingLot, ParkingRules, Section,
+                            Vehicle, VehicleType)
+from datetime import datetime, timedelta
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for faster (de)serialization."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+class _OrjsonSocketIOJson:
+    """
+    Adapter exposing the str-based dumps/loads interface Flask-SocketIO
+    expects, backed by orjson (which natively works with bytes).
+    """
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
-socketio = SocketIO(app, async_mode='threading')
+app.json = OrjsonProvider(app)
+socketio = SocketIO(app, async_mode='gevent', json=_OrjsonSocketIOJson)
 parking_lot = ParkingLot()
 
-# Configure logging to show timestamps, levels, and messages
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# The rules text is static policy copy; build it once instead of
+# re-formatting it on every receipt and status payload
+_RULES_TEXT = ParkingRules.get_rules_text()
+
+# Receipt strings derived from fixed rates/limits, formatted once at import
+# instead of per receipt
+_DAILY_RATE_STR = {vt: f"₹{ParkingRules.DAILY_RATES[vt]}" for vt in VehicleType}
+_DAILY_PRICING_STR = {vt: f"Daily Rate: ₹{ParkingRules.DAILY_RATES[vt]}" for vt in VehicleType}
+_MEMBERSHIP_PRICING_STR = {
+    vt: f"VIP Monthly Pass: ₹{ParkingRules.MONTHLY_MEMBERSHIP_RATES[vt]} (30 days unlimited parking)"
+    for vt in VehicleType
+}
+_TIME_LIMIT_STR = {ct: f"{ParkingRules.TIME_LIMITS[ct]} hours" for ct in CustomerType}
+_RE_ENTRY_FEE_STR = f"₹{ParkingRules.RE_ENTRY_RULES['re_entry_fee']}"
+
+# Frontend spellings mapped straight to enum members, replacing the
+# capitalize()-then-construct dance (and its 'Vip' special case) with one
+# dict lookup per field
+_VEHICLE_TYPE_MAP = {vt.value.lower(): vt for vt in VehicleType}
+_CUSTOMER_TYPE_MAP = {ct.value.lower(): ct for ct in CustomerType}
+
+# Configure logging to show timestamps, levels, and messages; production
+# deployments can quiet the per-request INFO lines via LOG_LEVEL=WARNING
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'),
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+def _build_levels_template():
+    """
+    Pre-materialize the nested levels structure sent to the frontend.
+
+    Only 'occupied' and 'ticket' ever change per slot; everything else
+    (ids, sections, EV flags, the dict shape itself) is static, so the
+    skeleton is built exactly once and refreshed in place afterwards.
+
+    Returns:
+        tuple: (levels dict keyed as the frontend expects,
+                slot_id -> slot dict map for in-place refreshes)
+    """
+    levels = {}
+    slot_dicts = {}
+    for level in [1, 2]:
+        levels[str(level)] = {}
+        for vehicle_type in VehicleType:
+            levels[str(level)][vehicle_type.value.lower()] = {}
+            for section in Section:
+                slots_data = []
+                for slot in parking_lot.slot_buckets.get((level, vehicle_type, section), []):
+                    slot_data = {
+                        'id': slot.id,
+                        'occupied': slot.is_occupied,
+                        'is_ev': slot.is_ev,
+                        'ticket': slot.vehicle.ticket_id if slot.is_occupied else None,
+                        'remaining_time': None  # Could calculate if needed
+                    }
+                    slot_dicts[slot.id] = slot_data
+                    slots_data.append(slot_data)
+                levels[str(level)][vehicle_type.value.lower()][section.value.lower()] = {
+                    'slots': slots_data
+                }
+    return levels, slot_dicts
+
+LEVELS_TEMPLATE, _SLOT_DICTS = _build_levels_template()
+
+def _build_levels():
+    """
+    Refresh the mutable fields of the pre-built levels structure and return it.
+
+    Shared by emit_status and api_status so the triple-nested loop they used
+    to duplicate runs zero times per request - just one linear pass over the
+    slots to update 'occupied' and 'ticket'.
+
+    Returns:
+        dict: Levels structure for visualization
+    """
+    for slot in parking_lot.get_all_slots():
+        slot_data = _SLOT_DICTS[slot.id]
+        slot_data['occupied'] = slot.is_occupied
+        slot_data['ticket'] = slot.vehicle.ticket_id if slot.is_occupied else None
+    return LEVELS_TEMPLATE
+
+@socketio.on('connect')
+def handle_connect():
+    """
+    Send the rules text and a full status snapshot when a client connects.
+
+    The rules are static, so they go out once per connection instead of
+    riding along on every status payload. Subsequent allocate/release
+    events only broadcast single-slot diffs, so the snapshot seeds the
+    client-side model the diffs are applied to.
+    """
+    emit('initial_rules', _RULES_TEXT)
+    emit_status()
 
 @app.route('/')
 def index():
@@ -69,46 +195,45 @@ def handle_request_slot(data):
     - 'error': Failure with error message
     - 'status_update': Broadcast to all clients
     """
-    logging.info(f"Received slot request: {data}")
+    logging.info("Received slot request: %s", data)
     try:
         # Parse and validate input data from frontend
-        vehicle_type_str = data['vehicle_type'].capitalize()  # 'small' -> 'Small'
-        customer_type_str = data['customer_type'].capitalize()  # 'vip' -> 'Vip' -> 'VIP', 'regular' -> 'Regular'
-        if customer_type_str == 'Vip':
-            customer_type_str = 'VIP'
+        vehicle_type = _VEHICLE_TYPE_MAP.get(data['vehicle_type'].lower())
+        customer_type = _CUSTOMER_TYPE_MAP.get(data['customer_type'].lower())
+        if vehicle_type is None or customer_type is None:
+            raise ValueError(f"Unknown vehicle/customer type: {data['vehicle_type']!r}/{data['customer_type']!r}")
+
         is_ev = data.get('is_ev', False)
         license_plate = data.get('license_plate', '').strip()
 
         # If no license plate provided, generate one
         if not license_plate:
-            license_plate = f"AUTO-{data.get('entry_time', 'NO-TIME')[:10].replace('-', '')}"
+            license_plate = "AUTO-" + data.get('entry_time', 'NO-TIME')[:10].replace('-', '')
 
-        logging.info(f"Parsed data - Vehicle: {vehicle_type_str}, Customer: {customer_type_str}, EV: {is_ev}, License: {license_plate}")
-
-        vehicle_type = VehicleType(vehicle_type_str)
-        customer_type = CustomerType(customer_type_str)
+        logging.info("Parsed data - Vehicle: %s, Customer: %s, EV: %s, License: %s",
+                     vehicle_type.value, customer_type.value, is_ev, license_plate)
 
         # Create vehicle object
         vehicle = Vehicle(vehicle_type, customer_type, license_plate)
 
         # Handle VIP pass creation/renewal
         if customer_type == CustomerType.VIP:
-            if (license_plate not in parking_lot.vip_passes or
-                datetime.now() > parking_lot.vip_passes[license_plate]):
+            now = datetime.now()
+            expiry = parking_lot.vip_passes.get(license_plate)
+            if expiry is None or now > expiry:
                 # Create new VIP pass
-                expiry = datetime.now() + timedelta(days=30)
+                expiry = now + timedelta(days=30)
                 parking_lot.vip_passes[license_plate] = expiry
-                vehicle.vip_pass_expiry = expiry
-                logging.info(f"Created new VIP pass for {license_plate}, expires: {expiry}")
+                logging.info("Created new VIP pass for %s, expires: %s", license_plate, expiry)
             else:
                 # Use existing pass
-                vehicle.vip_pass_expiry = parking_lot.vip_passes[license_plate]
-                logging.info(f"Using existing VIP pass for {license_plate}, expires: {vehicle.vip_pass_expiry}")
+                logging.info("Using existing VIP pass for %s, expires: %s", license_plate, expiry)
+            vehicle.vip_pass_expiry = expiry
 
         # Validate vehicle entry against policies
         can_enter, reason = parking_lot.validate_vehicle_entry(vehicle, is_ev)
         if not can_enter:
-            logging.warning(f"Entry validation failed for {vehicle}: {reason}")
+            logging.warning("Entry validation failed for %s: %s", vehicle, reason)
             emit('error', {'message': reason})
             return
 
@@ -116,15 +241,16 @@ def handle_request_slot(data):
         if vehicle.re_entry_count > 0:
             vehicle.record_re_entry()
 
-        logging.info(f"Created vehicle: {vehicle}")
+        logging.info("Created vehicle: %s", vehicle)
 
         # Attempt to allocate a slot
-        logging.info(f"Attempting allocation for {vehicle} (EV: {is_ev})")
+        logging.info("Attempting allocation for %s (EV: %s)", vehicle, is_ev)
         slot = parking_lot.allocate_slot(vehicle, is_ev)
-        logging.info(f"Allocation result: {slot.id if slot else 'None'}")
+        logging.info("Allocation result: %s", slot.id if slot else None)
         if slot:
 
-            logging.info(f"Allocated slot {slot.id} with ticket {vehicle.ticket_id} for {vehicle} (EV: {is_ev})")
+            logging.info("Allocated slot %s with ticket %s for %s (EV: %s)",
+                         slot.id, vehicle.ticket_id, vehicle, is_ev)
 
             # Generate allocation receipt
             receipt = generate_allocation_receipt(slot, vehicle, is_ev)
@@ -143,20 +269,20 @@ def handle_request_slot(data):
                 'receipt': receipt
             })
 
-            # Broadcast status update to all connected clients
-            emit_status()
+            # Broadcast the changed slot to all connected clients
+            emit_status_delta(slot)
         else:
-            logging.warning(f"No slot available for {vehicle} (EV: {is_ev})")
+            logging.warning("No slot available for %s (EV: %s)", vehicle, is_ev)
             emit('error', {'message': 'No suitable slot available. Please try again later.'})
 
     except ValueError as e:
-        logging.error(f"Invalid input data: {e}")
+        logging.error("Invalid input data: %s", e)
         emit('error', {'message': 'Invalid vehicle type or customer type provided.'})
     except KeyError as e:
-        logging.error(f"Missing required field: {e}")
+        logging.error("Missing required field: %s", e)
         emit('error', {'message': 'Missing required information. Please provide vehicle type and customer type.'})
     except Exception as e:
-        logging.error(f"Unexpected error in slot request: {e}")
+        logging.error("Unexpected error in slot request: %s", e)
         emit('error', {'message': 'Internal server error. Please try again.'})
 
 @socketio.on('release_slot')
@@ -178,7 +304,7 @@ def handle_release_slot(data):
     - 'status_update': Broadcast to all clients
     """
     ticket = data.get('ticket', '').strip()
-    logging.info(f"Received release request for ticket: {ticket}")
+    logging.info("Received release request for ticket: %s", ticket)
 
     if not ticket:
         emit('error', {'message': 'Ticket ID is required.'})
@@ -189,7 +315,7 @@ def handle_release_slot(data):
         exit_result = parking_lot.process_vehicle_exit(ticket)
 
         if not exit_result['success']:
-            logging.warning(f"Exit processing failed for ticket {ticket}: {exit_result['reason']}")
+            logging.warning("Exit processing failed for ticket %s: %s", ticket, exit_result['reason'])
             emit('error', {'message': exit_result['reason']})
             return
 
@@ -205,7 +331,8 @@ def handle_release_slot(data):
         duration = exit_time - slot.allocation_time
         hours = duration.total_seconds() / 3600
 
-        logging.info(f"Successfully released ticket {ticket}, total fee: ₹{total_fee:.2f}, duration: {hours:.2f} hours")
+        logging.info("Successfully released ticket %s, total fee: ₹%.2f, duration: %.2f hours",
+                     ticket, total_fee, hours)
 
         # Generate release receipt
         receipt = generate_release_receipt(slot, vehicle, base_fee, re_entry_fee, total_fee, hours, is_overstay, warnings)
@@ -223,13 +350,28 @@ def handle_release_slot(data):
             'receipt': receipt
         })
 
-        # Broadcast status update
-        emit_status()
+        # Broadcast the changed slot
+        emit_status_delta(slot)
 
     except Exception as e:
-        logging.error(f"Unexpected error in slot release: {e}")
+        logging.error("Unexpected error in slot release: %s", e)
         emit('error', {'message': 'Internal server error. Please try again.'})
 
+def _compact_timestamp(dt):
+    """
+    Format a datetime as YYYYMMDDHHMMSS for QR codes.
+
+    Equivalent to strftime('%Y%m%d%H%M%S') but skips the format-string
+    parser, which receipts would otherwise pay for on every request.
+
+    Args:
+        dt (datetime): Timestamp to format
+
+    Returns:
+        str: Compact 14-digit timestamp
+    """
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
+
 def generate_allocation_receipt(slot, vehicle, is_ev=False):
     """
     Generate a receipt for slot allocation with comprehensive policy information.
@@ -246,20 +388,15 @@ def generate_allocation_receipt(slot, vehicle, is_ev=False):
     expiry_time = slot.allocation_time + timedelta(hours=time_limit_hours)
 
     if vehicle.customer_type == CustomerType.VIP:
+        pricing_info = _MEMBERSHIP_PRICING_STR[vehicle.vehicle_type]
+        time_limit = "Unlimited (VIP Pass)"
         if vehicle.vip_pass_expiry:
-            membership_fee = ParkingRules.MONTHLY_MEMBERSHIP_RATES[vehicle.vehicle_type]
-            pricing_info = f"VIP Monthly Pass: ₹{membership_fee} (30 days unlimited parking)"
-            time_limit = "Unlimited (VIP Pass)"
             expiry_time = vehicle.vip_pass_expiry
         else:
-            membership_fee = ParkingRules.MONTHLY_MEMBERSHIP_RATES[vehicle.vehicle_type]
-            pricing_info = f"VIP Monthly Pass: ₹{membership_fee} (30 days unlimited parking)"
-            time_limit = "Unlimited (VIP Pass)"
             expiry_time = slot.allocation_time + timedelta(days=30)
     else:
-        daily_rate = ParkingRules.DAILY_RATES[vehicle.vehicle_type]
-        pricing_info = f"Daily Rate: ₹{daily_rate}"
-        time_limit = f"{time_limit_hours} hours"
+        pricing_info = _DAILY_PRICING_STR[vehicle.vehicle_type]
+        time_limit = _TIME_LIMIT_STR[vehicle.customer_type]
 
     return {
         'title': 'Parking Slot Allocation Receipt',
@@ -271,14 +408,14 @@ def generate_allocation_receipt(slot, vehicle, is_ev=False):
         'customer_type': vehicle.customer_type.value,
         'license_plate': vehicle.license_plate,
         'is_ev': is_ev,
-        'allocation_time': slot.allocation_time.strftime('%Y-%m-%d %H:%M:%S'),
-        'expiry_time': expiry_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'allocation_time': slot.allocation_time.isoformat(sep=' ', timespec='seconds'),
+        'expiry_time': expiry_time.isoformat(sep=' ', timespec='seconds'),
         'time_limit': time_limit,
         'pricing_info': pricing_info,
-        'daily_rate': f"₹{ParkingRules.DAILY_RATES[vehicle.vehicle_type]}",
-        're_entry_fee': f"₹{ParkingRules.RE_ENTRY_RULES['re_entry_fee']}" if vehicle.re_entry_count > 0 else "₹0",
-        'rules': ParkingRules.get_rules_text(),
-        'qr_code': f"PARK-{vehicle.ticket_id}-{slot.allocation_time.strftime('%Y%m%d%H%M%S')}"
+        'daily_rate': _DAILY_RATE_STR[vehicle.vehicle_type],
+        're_entry_fee': _RE_ENTRY_FEE_STR if vehicle.re_entry_count > 0 else "₹0",
+        'rules': _RULES_TEXT,
+        'qr_code': f"PARK-{vehicle.ticket_id}-{_compact_timestamp(slot.allocation_time)}"
     }
 
 def generate_release_receipt(slot, vehicle, base_fee, re_entry_fee, total_fee, hours, is_overstay, warnings):
@@ -298,8 +435,12 @@ def generate_release_receipt(slot, vehicle, base_fee, re_entry_fee, total_fee, h
     Returns:
         dict: Receipt data for the client
     """
+    # Capture a single timestamp so the release time, QR code, and VIP pass
+    # check all agree on "now"
+    now = datetime.now()
+
     # Handle case where allocation_time might be None (shouldn't happen in normal flow)
-    alloc_time_str = slot.allocation_time.strftime('%Y-%m-%d %H:%M:%S') if slot.allocation_time else 'Unknown'
+    alloc_time_str = slot.allocation_time.isoformat(sep=' ', timespec='seconds') if slot.allocation_time else 'Unknown'
 
     receipt = {
         'title': 'Parking Release Receipt',
@@ -309,20 +450,20 @@ def generate_release_receipt(slot, vehicle, base_fee, re_entry_fee, total_fee, h
         'customer_type': vehicle.customer_type.value,
         'license_plate': vehicle.license_plate,
         'allocation_time': alloc_time_str,
-        'release_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'release_time': now.isoformat(sep=' ', timespec='seconds'),
         'duration_hours': round(hours, 2),
         'base_fee': f"₹{base_fee:.2f}",
         're_entry_fee': f"₹{re_entry_fee:.2f}",
         'total_fee': f"₹{total_fee:.2f}",
         'overstay': is_overstay,
         'warnings_issued': warnings,
-        'rules': ParkingRules.get_rules_text(),
-        'qr_code': f"RELEASE-{vehicle.ticket_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        'rules': _RULES_TEXT,
+        'qr_code': f"RELEASE-{vehicle.ticket_id}-{_compact_timestamp(now)}"
     }
 
     # Add VIP pass information
-    if vehicle.vip_pass_expiry and datetime.now() < vehicle.vip_pass_expiry:
-        receipt['vip_pass_info'] = f"VIP Pass active until {vehicle.vip_pass_expiry.strftime('%Y-%m-%d %H:%M:%S')} - No parking fee charged"
+    if vehicle.vip_pass_expiry and now < vehicle.vip_pass_expiry:
+        receipt['vip_pass_info'] = f"VIP Pass active until {vehicle.vip_pass_expiry.isoformat(sep=' ', timespec='seconds')} - No parking fee charged"
     elif vehicle.customer_type == CustomerType.VIP:
         receipt['vip_pass_info'] = "VIP Pass expired - Standard fees apply"
 
@@ -334,54 +475,111 @@ def generate_release_receipt(slot, vehicle, base_fee, re_entry_fee, total_fee, h
 
     return receipt
 
-def emit_status():
+def emit_status_delta(slot):
+    """
+    Broadcast a single-slot diff to all connected clients.
+
+    Allocations and releases change exactly one slot, so instead of
+    re-serializing the entire lot per event we send the changed slot plus
+    refreshed counters; the frontend patches its cached snapshot.
+
+    Args:
+        slot (Slot): The slot that was just allocated or released
+    """
+    now = datetime.now()
+    socketio.emit('status_delta', {
+        'slot_id': slot.id,
+        'occupied': slot.is_occupied,
+        'ticket': slot.vehicle.ticket_id if slot.is_occupied else None,
+        'counters': _build_counters(now),
+        'timestamp': now.isoformat()
+    })
+
+def _build_counters(now=None):
+    """
+    Build the counters section from the lot's O(1) occupancy accessors.
+
+    Args:
+        now (datetime): Reference time, defaults to datetime.now()
+
+    Returns:
+        dict: Total/occupied/available/expired slot counts
+    """
+    if now is None:
+        now = datetime.now()
+    return {
+        'total': parking_lot.total_count,
+        'occupied': parking_lot.occupied_count,
+        'available': parking_lot.available_count,
+        'expired': parking_lot.expired_count(now)
+    }
+
+def _build_status_dict(now=None):
+    """
+    Build the status structure shared by the WebSocket snapshot and /api/status.
+
+    Single source of truth for the counters/levels/rules/timestamp shape;
+    api_status extends the result with its REST-only sections before
+    encoding.
+
+    Args:
+        now (datetime): Reference time, defaults to datetime.now()
+
+    Returns:
+        dict: Status data with counters, levels structure, rules, and timestamp
+    """
+    if now is None:
+        now = datetime.now()
+    return {
+        'counters': _build_counters(now),
+        'levels': _build_levels(),
+        'timestamp': now.isoformat()
+    }
+
+def _do_emit_status():
     """
     Emit current parking lot status to all connected clients.
 
     Broadcasts slot availability counts, occupied slot details, and policy information.
     """
-    occupied_slots = parking_lot.get_occupied_slots()
-    all_slots = parking_lot.get_all_slots()
+    socketio.emit('status_update', _build_status_dict())
+
+# Coalescing state for full-status broadcasts: emit_status only raises the
+# pending flag and a single background task flushes it every 100ms, so a
+# burst of triggers produces one broadcast instead of one per event
+_status_pending = False
+_status_flusher = None
+
+def _status_flush_loop():
+    """Background task flushing pending status broadcasts at most 10x/sec."""
+    global _status_pending
+    while True:
+        socketio.sleep(0.1)
+        if _status_pending:
+            _status_pending = False
+            _do_emit_status()
 
-    # Build levels structure for visualization
-    levels = {}
-    for level in [1, 2]:
-        levels[str(level)] = {}
-        for vehicle_type in VehicleType:
-            levels[str(level)][vehicle_type.value.lower()] = {}
-            for section in Section:
-                # Get slots for this level, vehicle_type, section
-                section_slots = [slot for slot in all_slots
-                               if slot.level == level and slot.vehicle_type == vehicle_type and slot.section == section]
+def emit_status():
+    """
+    Request a full status broadcast, coalesced into the next flush window.
 
-                # Convert to dict format expected by frontend
-                slots_data = []
-                for slot in section_slots:
-                    slot_data = {
-                        'id': slot.id,
-                        'occupied': slot.is_occupied,
-                        'is_ev': slot.section == Section.EV,
-                        'ticket': slot.vehicle.ticket_id if slot.is_occupied else None,
-                        'remaining_time': None  # Could calculate if needed
-                    }
-                    slots_data.append(slot_data)
+    Callers fire-and-forget; concurrent requests within the same 100ms
+    window share a single broadcast.
+    """
+    global _status_pending, _status_flusher
+    _status_pending = True
+    if _status_flusher is None:
+        _status_flusher = socketio.start_background_task(_status_flush_loop)
 
-                levels[str(level)][vehicle_type.value.lower()][section.value.lower()] = {
-                    'slots': slots_data
-                }
+# Payload sections /api/status can serve; requests without ?fields= get all
+# of them for backward compatibility
+_STATUS_FIELDS = ('counters', 'available_slots', 'occupied_slots', 'levels', 'rules')
 
-    status = {
-        'counters': {
-            'total': len(all_slots),
-            'occupied': len(occupied_slots),
-            'available': len(all_slots) - len(occupied_slots),
-            'expired': len(parking_lot.check_expired_slots())
-        },
-        'levels': levels,
-        'rules': ParkingRules.get_rules_text(),
-        'timestamp': datetime.now().isoformat()
-    }
-    socketio.emit('status_update', status)
+# Encoded /api/status payloads keyed by requested fields, plus the expired
+# count they were built with; reused verbatim between lot mutations so idle
+# polls skip the rebuild
+_status_cache = {}
+_status_cache_expired = None
 
 @app.route('/api/status')
 def api_status():
@@ -389,50 +587,45 @@ def api_status():
     REST API endpoint for parking lot status.
 
     Returns comprehensive status including available slots, occupied slots,
-    structured levels data, and policy information for visualization.
+    structured levels data, and policy information for visualization. Clients
+    that only need part of the payload can pass ?fields=counters,levels (any
+    comma-separated subset of counters, available_slots, occupied_slots,
+    levels, rules) and the other sections are never built.
+
+    Encoded payloads are cached per fields selection and served as-is until
+    the lot mutates (tracked by ParkingLot.status_dirty) or a parked vehicle
+    crosses its expiry, so repeated polls between events cost a couple of
+    O(1) checks.
 
     Returns:
-        JSON: Status data with counters, available slots, occupied slots, levels structure, and rules
+        JSON: Status data with the requested sections and a timestamp
     """
-    occupied_slots = parking_lot.get_occupied_slots()
-    all_slots = parking_lot.get_all_slots()
-
-    # Build levels structure for visualization
-    levels = {}
-    for level in [1, 2]:
-        levels[str(level)] = {}
-        for vehicle_type in VehicleType:
-            levels[str(level)][vehicle_type.value.lower()] = {}
-            for section in Section:
-                # Get slots for this level, vehicle_type, section
-                section_slots = [slot for slot in all_slots
-                               if slot.level == level and slot.vehicle_type == vehicle_type and slot.section == section]
-
-                # Convert to dict format expected by frontend
-                slots_data = []
-                for slot in section_slots:
-                    slot_data = {
-                        'id': slot.id,
-                        'occupied': slot.is_occupied,
-                        'is_ev': slot.section == Section.EV,
-                        'ticket': slot.vehicle.ticket_id if slot.is_occupied else None,
-                        'remaining_time': None  # Could calculate if needed
-                    }
-                    slots_data.append(slot_data)
-
-                levels[str(level)][vehicle_type.value.lower()][section.value.lower()] = {
-                    'slots': slots_data
-                }
-
-    return jsonify({
-        'counters': {
-            'total': len(all_slots),
-            'occupied': len(occupied_slots),
-            'available': len(all_slots) - len(occupied_slots),
-            'expired': len(parking_lot.check_expired_slots())
-        },
-        'available_slots': parking_lot.get_available_slots_count(),
-        'occupied_slots': [
+    global _status_cache_expired
+
+    now = datetime.now()
+    expired = parking_lot.expired_count(now)
+    if parking_lot.status_dirty or expired != _status_cache_expired:
+        _status_cache.clear()
+        _status_cache_expired = expired
+        parking_lot.status_dirty = False
+
+    fields_arg = request.args.get('fields')
+    if fields_arg:
+        wanted = tuple(f for f in _STATUS_FIELDS if f in fields_arg.split(','))
+    else:
+        wanted = _STATUS_FIELDS
+
+    cached = _status_cache.get(wanted)
+    if cached is not None:
+        return app.response_class(cached, mimetype='application/json')
+
+    payload = {}
+    if 'counters' in wanted:
+        payload['counters'] = _build_counters(now)
+    if 'available_slots' in wanted:
+        payload['available_slots'] = parking_lot.get_available_slots_count()
+    if 'occupied_slots' in wanted:
+        payload['occupied_slots'] = [
             {
                 'slot_id': slot.id,
                 'level': slot.level,
@@ -443,13 +636,18 @@ def api_status():
                 'ticket': slot.vehicle.ticket_id,
                 'allocation_time': slot.allocation_time.isoformat() if slot.allocation_time else None
             }
-            for slot in occupied_slots
-        ],
-        'levels': levels,
-        'rules': ParkingRules.get_rules_text(),
-        'timestamp': datetime.now().isoformat()
-    })
+            for slot in parking_lot.get_occupied_slots()
+        ]
+    if 'levels' in wanted:
+        payload['levels'] = _build_levels()
+    if 'rules' in wanted:
+        payload['rules'] = _RULES_TEXT
+    payload['timestamp'] = now.isoformat()
+
+    body = orjson.dumps(payload)
+    _status_cache[wanted] = body
+    return app.response_class(body, mimetype='application/json')
 
 if __name__ == '__main__':
     logging.info("Starting Parking Management System on port 5000")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
\ No newline at end of file
+    socketio.run(app, host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
@@ -28,11 +28,6 @@ import webbrowser
 import time
 import signal
 import sys
-import os
-
-import gevent
-from gevent import monkey
-monkey.patch_all()
 
 
 def main():
@@ -75,6 +70,4 @@ def main():
         signal_handler(signal.SIGINT, None)
 
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    print(f"Starting Parking Management System on port {port}")
-    socketio.run(app, host='0.0.0.0', port=port)
\ No newline at end of file
+    main()
\ No newline at end of file